@@ -1,5 +1,9 @@
+import os
+import tempfile
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -15,12 +19,36 @@ st.title("📊 Customer Segmentation Analysis Dashboard")
 st.markdown("### RFM-Based Customer Segmentation for E-Commerce")
 st.markdown("---")
 
+# Read the Parquet copy of a CSV if it is at least as new as the CSV;
+# otherwise parse the CSV and (re)write the Parquet copy (Snappy) so later
+# cold starts skip CSV parsing
+def read_table(csv_path):
+    parquet_path = csv_path.rsplit('.', 1)[0] + '.parquet'
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        return pd.read_parquet(parquet_path)
+    
+    data = pd.read_csv(csv_path, engine='pyarrow')
+    # Write to a temp file next to the target and swap it in, so an
+    # interrupted write never leaves a truncated Parquet file behind
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=os.path.dirname(parquet_path))
+        os.close(fd)
+        data.to_parquet(tmp_path, compression='snappy', index=False)
+        os.replace(tmp_path, parquet_path)
+    except OSError:
+        # read-only data folder, keep using the CSV
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
 # Load data with better error handling
 @st.cache_data
 def load_data():
     try:
         # Load RFM data
-        rfm = pd.read_csv('data/rfm_analysis.csv')
+        rfm = read_table('data/rfm_analysis.csv')
         
         # Check if first column is unnamed (it's the index)
         if rfm.columns[0] in ['Unnamed: 0', 'index']:
@@ -32,223 +60,365 @@ def load_data():
             if 'index' in rfm.columns:
                 rfm.rename(columns={'index': 'CustomerID'}, inplace=True)
         
-        # Load transaction data
-        df = pd.read_csv('data/cleaned_online_retail.csv')
-        df['InvoiceDate'] = pd.to_datetime(df['InvoiceDate'])
+        # Downcast integer RFM metrics and scores to cut the bytes scanned
+        # downstream. Monetary stays float64: revenue is displayed to the cent.
+        rfm_dtypes = {'Recency': 'int32', 'Frequency': 'int32',
+                      'R_Score': 'int8', 'F_Score': 'int8', 'M_Score': 'int8',
+                      'RFM_Score': 'int8', 'RFM_Segment': 'int16'}
+        rfm = rfm.astype({col: dtype for col, dtype in rfm_dtypes.items() if col in rfm.columns})
         
-        return rfm, df
+        # Segments as a categorical: integer codes for groupby/filter and
+        # the segment list is available without scanning the column. The
+        # categories keep order of appearance, as the sidebar list and the
+        # scatter colours did before.
+        if 'Customer_Segment' in rfm.columns:
+            segment_order = rfm['Customer_Segment'].dropna().unique()
+            rfm['Customer_Segment'] = rfm['Customer_Segment'].astype(pd.CategoricalDtype(segment_order))
+        
+        return rfm
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return None, None
+        return None
 
-rfm, df = load_data()
+# Rows of the selected segment, matched on the categorical's integer codes.
+# Called once per rerun; every section receives the returned frame.
+def get_filtered(rfm, selected_segment):
+    if selected_segment == 'All':
+        return rfm
+    code = rfm['Customer_Segment'].cat.categories.get_loc(selected_segment)
+    mask = rfm['Customer_Segment'].cat.codes.to_numpy() == code
+    return rfm.iloc[mask]
 
-if rfm is not None and df is not None:
-    
-    # Debug info (you can remove this later)
-    with st.expander("🔍 Debug Info - Column Names"):
-        st.write("RFM Columns:", rfm.columns.tolist())
-        st.write("RFM Shape:", rfm.shape)
-        st.write("First row:", rfm.head(1))
-    
-    # Sidebar filters
-    st.sidebar.header("🔍 Filters")
+# Per-segment aggregates shared by the heatmap, revenue chart and summary table
+@st.cache_data
+def segment_agg(rfm):
+    return rfm.groupby('Customer_Segment', observed=True).agg(
+        Recency=('Recency', 'mean'),
+        Frequency=('Frequency', 'mean'),
+        MonetaryMean=('Monetary', 'mean'),
+        Revenue=('Monetary', 'sum'),
+        Count=('Monetary', 'count')
+    )
+
+# Customers per segment, shared by the segment bar and pie charts
+@st.cache_data
+def get_segment_counts(rfm):
+    segment_counts = rfm['Customer_Segment'].value_counts().reset_index()
+    segment_counts.columns = ['Segment', 'Count']
+    return segment_counts
+
+# Top-n Monetary values via a partial selection, sorting only the n winners
+@st.cache_data
+def top_monetary(rfm, n=10):
+    arr = rfm['Monetary'].dropna().to_numpy()
+    n = min(n, len(arr))
+    if n == 0:
+        return pd.DataFrame({'Monetary': arr[:0]})
+    idx = np.argpartition(arr, len(arr) - n)[len(arr) - n:]
+    idx = idx[np.argsort(arr[idx])[::-1]]
+    return pd.DataFrame({'Monetary': arr[idx]})
+
+# Cap the 3D scatter at k points, sampling each segment proportionally
+@st.cache_data
+def sample_for_scatter(df, k=5000):
+    if len(df) <= k:
+        return df
+    if 'Customer_Segment' in df.columns:
+        # At least one point per segment so small segments stay in the legend
+        return pd.concat([
+            group.sample(n=max(1, round(k * len(group) / len(df))), random_state=42)
+            for _, group in df.groupby('Customer_Segment', observed=True)
+        ])
+    return df.sample(n=k, random_state=42)
+
+# Bin a column server-side so only the bin counts are sent to the browser
+@st.cache_data
+def rfm_histogram(rfm_filtered, column, bins=50):
+    counts, edges = np.histogram(rfm_filtered[column].dropna().to_numpy(), bins=bins)
+    return edges, counts
+
+# Key metric values for the selected segment. A single segment reads its row
+# from the segment aggregates; 'All' is computed from the rows directly.
+def key_metric_values(rfm_filtered, seg_agg, selected_segment):
+    if seg_agg is not None and selected_segment != 'All':
+        row = seg_agg.loc[selected_segment]
+        return row['Recency'], row['Frequency'], row['Revenue']
     
-    # Check if Customer_Segment column exists
-    if 'Customer_Segment' in rfm.columns:
-        segments = ['All'] + list(rfm['Customer_Segment'].unique())
-        selected_segment = st.sidebar.selectbox("Select Customer Segment", segments)
-        
-        # Filter data based on selection
-        if selected_segment != 'All':
-            rfm_filtered = rfm[rfm['Customer_Segment'] == selected_segment]
-        else:
-            rfm_filtered = rfm
+    columns = rfm_filtered.columns
+    avg_recency = rfm_filtered['Recency'].mean() if 'Recency' in columns else None
+    avg_frequency = rfm_filtered['Frequency'].mean() if 'Frequency' in columns else None
+    total_revenue = rfm_filtered['Monetary'].sum() if 'Monetary' in columns else None
+    return avg_recency, avg_frequency, total_revenue
+
+# Layout shared by the 400px charts. Streamlit sizes the chart container from
+# figure.layout.height, so the height is written to each figure directly.
+def apply_chart_layout(fig, **layout):
+    fig.update_layout(height=400, **layout)
+    return fig
+
+# Figure builders. Figures are cached as resources keyed on their (small)
+# inputs, so a rerun with unchanged inputs reuses the built figure.
+@st.cache_resource
+def build_segment_bar(segment_counts):
+    fig = px.bar(segment_counts, x='Segment', y='Count',
+                 title='Customer Count by Segment',
+                 color='Count',
+                 color_continuous_scale='Viridis')
+    return apply_chart_layout(fig, xaxis_tickangle=-45)
+
+@st.cache_resource
+def build_segment_pie(segment_counts):
+    fig = px.pie(segment_counts, values='Count', names='Segment',
+                 title='Segment Distribution (%)',
+                 hole=0.4)
+    return apply_chart_layout(fig)
+
+@st.cache_resource
+def build_rfm_heatmap(segment_rfm):
+    # One transposed array for z; cell labels pre-formatted as plain strings
+    z = segment_rfm.to_numpy(dtype='float64').T
+    text = [[f'{v:.1f}' for v in row] for row in z]
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=segment_rfm.index,
+        y=['Recency', 'Frequency', 'Monetary'],
+        colorscale='RdYlGn_r',
+        text=text,
+        texttemplate='%{text}',
+        textfont={"size": 10}
+    ))
+    return apply_chart_layout(
+        fig,
+        title='Average RFM Values by Segment',
+        xaxis_title='Customer Segment',
+        yaxis_title='RFM Metrics'
+    )
+
+@st.cache_resource
+def build_rfm_scatter(rfm_scatter):
+    if 'Customer_Segment' in rfm_scatter.columns:
+        fig = px.scatter_3d(rfm_scatter, x='Recency', y='Frequency', z='Monetary',
+                            color='Customer_Segment',
+                            title='3D RFM Visualization',
+                            labels={'Recency': 'Recency (Days)', 
+                                   'Frequency': 'Frequency (Orders)',
+                                   'Monetary': 'Monetary ($)'},
+                            opacity=0.7)
     else:
-        st.warning("Customer_Segment column not found. Showing all data.")
-        rfm_filtered = rfm
-        selected_segment = 'All'
-    
-    # Key Metrics (Top of dashboard)
+        fig = px.scatter_3d(rfm_scatter, x='Recency', y='Frequency', z='Monetary',
+                            title='3D RFM Visualization',
+                            labels={'Recency': 'Recency (Days)', 
+                                   'Frequency': 'Frequency (Orders)',
+                                   'Monetary': 'Monetary ($)'},
+                            opacity=0.7)
+    return apply_chart_layout(fig)
+
+@st.cache_resource
+def build_segment_revenue(segment_revenue):
+    fig = px.bar(segment_revenue, x='Segment', y='Revenue',
+                 title='Total Revenue by Segment',
+                 color='Revenue',
+                 color_continuous_scale='Blues')
+    return apply_chart_layout(fig, xaxis_tickangle=-45)
+
+@st.cache_resource
+def build_top_customers(top_customers):
+    top_customers = top_customers.assign(
+        Customer=['Customer ' + str(i+1) for i in range(len(top_customers))])
+    fig = px.bar(top_customers, x='Monetary', y='Customer',
+                 orientation='h',
+                 title='Top 10 Customers by Revenue',
+                 color='Monetary',
+                 color_continuous_scale='Oranges')
+    return apply_chart_layout(fig, yaxis={'categoryorder':'total ascending'})
+
+@st.cache_resource
+def build_histogram(edges, counts, title, x_label):
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts,
+                           width=np.diff(edges), marker_line_width=0))
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title='count',
+                      bargap=0, height=350)
+    return fig
+
+# Dashboard sections, rendered in order by the script body
+def render_key_metrics(rfm_filtered, seg_agg, selected_segment):
     st.header("📈 Key Metrics")
     col1, col2, col3, col4 = st.columns(4)
+    avg_recency, avg_frequency, total_revenue = key_metric_values(rfm_filtered, seg_agg, selected_segment)
     
     with col1:
         st.metric("Total Customers", f"{len(rfm_filtered):,}")
     with col2:
-        if 'Recency' in rfm_filtered.columns:
-            st.metric("Avg Recency (Days)", f"{rfm_filtered['Recency'].mean():.1f}")
+        if avg_recency is not None:
+            st.metric("Avg Recency (Days)", f"{avg_recency:.1f}")
         else:
             st.metric("Avg Recency", "N/A")
     with col3:
-        if 'Frequency' in rfm_filtered.columns:
-            st.metric("Avg Frequency", f"{rfm_filtered['Frequency'].mean():.1f}")
+        if avg_frequency is not None:
+            st.metric("Avg Frequency", f"{avg_frequency:.1f}")
         else:
             st.metric("Avg Frequency", "N/A")
     with col4:
-        if 'Monetary' in rfm_filtered.columns:
-            st.metric("Total Revenue", f"${rfm_filtered['Monetary'].sum():,.2f}")
+        if total_revenue is not None:
+            st.metric("Total Revenue", f"${total_revenue:,.2f}")
         else:
             st.metric("Total Revenue", "N/A")
     
     st.markdown("---")
+
+def render_segment_distribution(rfm):
+    st.header("👥 Customer Segment Distribution")
+    col1, col2 = st.columns(2)
+    segment_counts = get_segment_counts(rfm)
+    
+    with col1:
+        # Bar chart
+        fig1 = build_segment_bar(segment_counts)
+        st.plotly_chart(fig1, use_container_width=True)
+    
+    with col2:
+        # Pie chart
+        fig2 = build_segment_pie(segment_counts)
+        st.plotly_chart(fig2, use_container_width=True)
+    
+    st.markdown("---")
+
+def render_rfm_analysis(rfm_filtered, seg_agg):
+    st.header("🔍 RFM Analysis")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # RFM Heatmap
+        if seg_agg is not None:
+            # Segments alphabetically on the x-axis, as with the original string groupby
+            segment_rfm = seg_agg[['Recency', 'Frequency', 'MonetaryMean']].rename(
+                columns={'MonetaryMean': 'Monetary'}).round(2).sort_index(key=lambda i: i.astype(str))
+            
+            fig3 = build_rfm_heatmap(segment_rfm)
+            st.plotly_chart(fig3, use_container_width=True)
+    
+    with col2:
+        # 3D Scatter plot (downsampled to keep the browser responsive)
+        rfm_scatter = sample_for_scatter(rfm_filtered)
+        fig4 = build_rfm_scatter(rfm_scatter)
+        st.plotly_chart(fig4, use_container_width=True)
+    
+    st.markdown("---")
+
+def render_revenue_analysis(rfm, seg_agg):
+    st.header("💰 Revenue Analysis")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Revenue by segment
+        if seg_agg is not None:
+            segment_revenue = seg_agg['Revenue'].sort_values(ascending=False).reset_index()
+            segment_revenue.columns = ['Segment', 'Revenue']
+            
+            fig5 = build_segment_revenue(segment_revenue)
+            st.plotly_chart(fig5, use_container_width=True)
+    
+    with col2:
+        # Top customers
+        top_customers = top_monetary(rfm)
+        fig6 = build_top_customers(top_customers)
+        st.plotly_chart(fig6, use_container_width=True)
+    
+    st.markdown("---")
+
+def render_distributions(rfm_filtered):
+    st.header("📊 RFM Distributions")
+    tab1, tab2, tab3 = st.tabs(["Recency", "Frequency", "Monetary"])
+    
+    with tab1:
+        edges, counts = rfm_histogram(rfm_filtered, 'Recency')
+        fig7 = build_histogram(edges, counts, 'Recency Distribution', 'Days Since Last Purchase')
+        st.plotly_chart(fig7, use_container_width=True)
+    
+    with tab2:
+        edges, counts = rfm_histogram(rfm_filtered, 'Frequency')
+        fig8 = build_histogram(edges, counts, 'Frequency Distribution', 'Number of Purchases')
+        st.plotly_chart(fig8, use_container_width=True)
+    
+    with tab3:
+        edges, counts = rfm_histogram(rfm_filtered, 'Monetary')
+        fig9 = build_histogram(edges, counts, 'Monetary Distribution', 'Total Spend ($)')
+        st.plotly_chart(fig9, use_container_width=True)
+    
+    st.markdown("---")
+
+def render_segment_summary(seg_agg):
+    st.header("📋 Segment Summary Table")
+    segment_summary = seg_agg.round(2)
+    
+    segment_summary.columns = ['Avg Recency', 'Avg Frequency', 'Avg Monetary', 'Total Revenue', 'Customer Count']
+    segment_summary = segment_summary.sort_values('Total Revenue', ascending=False)
+    
+    st.dataframe(segment_summary, use_container_width=True)
+    
+    st.markdown("---")
+
+def render_raw_sample(rfm_filtered):
+    st.header("📄 Raw Data Sample")
+    st.dataframe(rfm_filtered.head(20), use_container_width=True)
+
+rfm = load_data()
+
+if rfm is not None:
+    
+    # Sidebar filters
+    st.sidebar.header("🔍 Filters")
+    
+    # Check if Customer_Segment column exists
+    if 'Customer_Segment' in rfm.columns:
+        segments = ['All'] + rfm['Customer_Segment'].cat.categories.tolist()
+        selected_segment = st.sidebar.selectbox("Select Customer Segment", segments)
+    else:
+        st.warning("Customer_Segment column not found. Showing all data.")
+        selected_segment = 'All'
+    
+    # Debug info, only built when switched on in the sidebar
+    if st.sidebar.checkbox("Show debug info", False):
+        with st.expander("🔍 Debug Info - Column Names"):
+            st.write("RFM Columns:", rfm.columns.tolist())
+            st.write("RFM Shape:", rfm.shape)
+            st.write("RFM Memory (KB):", round(rfm.memory_usage(deep=True).sum() / 1024, 1))
+            st.write("First row:", rfm.head(1))
+    
+    # Filter data once; every section below receives this same frame
+    rfm_filtered = get_filtered(rfm, selected_segment)
+    
+    # Compute segment aggregates once (cached) and slice them for each view
+    if 'Customer_Segment' in rfm.columns and all(col in rfm.columns for col in ['Recency', 'Frequency', 'Monetary']):
+        seg_agg = segment_agg(rfm)
+    else:
+        seg_agg = None
+    
+    # Key Metrics (Top of dashboard)
+    render_key_metrics(rfm_filtered, seg_agg, selected_segment)
     
     # Row 1: Segment Distribution
     if 'Customer_Segment' in rfm.columns:
-        st.header("👥 Customer Segment Distribution")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Bar chart
-            segment_counts = rfm['Customer_Segment'].value_counts().reset_index()
-            segment_counts.columns = ['Segment', 'Count']
-            
-            fig1 = px.bar(segment_counts, x='Segment', y='Count',
-                         title='Customer Count by Segment',
-                         color='Count',
-                         color_continuous_scale='Viridis')
-            fig1.update_layout(xaxis_tickangle=-45, height=400)
-            st.plotly_chart(fig1, use_container_width=True)
-        
-        with col2:
-            # Pie chart
-            fig2 = px.pie(segment_counts, values='Count', names='Segment',
-                         title='Segment Distribution (%)',
-                         hole=0.4)
-            fig2.update_layout(height=400)
-            st.plotly_chart(fig2, use_container_width=True)
-        
-        st.markdown("---")
+        render_segment_distribution(rfm)
     
     # Row 2: RFM Analysis
     if all(col in rfm.columns for col in ['Recency', 'Frequency', 'Monetary']):
-        st.header("🔍 RFM Analysis")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # RFM Heatmap
-            if 'Customer_Segment' in rfm.columns:
-                segment_rfm = rfm.groupby('Customer_Segment')[['Recency', 'Frequency', 'Monetary']].mean().round(2)
-                
-                fig3 = go.Figure(data=go.Heatmap(
-                    z=segment_rfm.values.T,
-                    x=segment_rfm.index,
-                    y=['Recency', 'Frequency', 'Monetary'],
-                    colorscale='RdYlGn_r',
-                    text=segment_rfm.values.T,
-                    texttemplate='%{text:.1f}',
-                    textfont={"size": 10}
-                ))
-                fig3.update_layout(
-                    title='Average RFM Values by Segment',
-                    xaxis_title='Customer Segment',
-                    yaxis_title='RFM Metrics',
-                    height=400
-                )
-                st.plotly_chart(fig3, use_container_width=True)
-        
-        with col2:
-            # 3D Scatter plot
-            if 'Customer_Segment' in rfm_filtered.columns:
-                fig4 = px.scatter_3d(rfm_filtered, x='Recency', y='Frequency', z='Monetary',
-                                    color='Customer_Segment',
-                                    title='3D RFM Visualization',
-                                    labels={'Recency': 'Recency (Days)', 
-                                           'Frequency': 'Frequency (Orders)',
-                                           'Monetary': 'Monetary ($)'},
-                                    opacity=0.7)
-            else:
-                fig4 = px.scatter_3d(rfm_filtered, x='Recency', y='Frequency', z='Monetary',
-                                    title='3D RFM Visualization',
-                                    labels={'Recency': 'Recency (Days)', 
-                                           'Frequency': 'Frequency (Orders)',
-                                           'Monetary': 'Monetary ($)'},
-                                    opacity=0.7)
-            fig4.update_layout(height=400)
-            st.plotly_chart(fig4, use_container_width=True)
-        
-        st.markdown("---")
+        render_rfm_analysis(rfm_filtered, seg_agg)
     
     # Row 3: Revenue Analysis
     if 'Monetary' in rfm.columns:
-        st.header("💰 Revenue Analysis")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Revenue by segment
-            if 'Customer_Segment' in rfm.columns:
-                segment_revenue = rfm.groupby('Customer_Segment')['Monetary'].sum().sort_values(ascending=False).reset_index()
-                segment_revenue.columns = ['Segment', 'Revenue']
-                
-                fig5 = px.bar(segment_revenue, x='Segment', y='Revenue',
-                             title='Total Revenue by Segment',
-                             color='Revenue',
-                             color_continuous_scale='Blues')
-                fig5.update_layout(xaxis_tickangle=-45, height=400)
-                st.plotly_chart(fig5, use_container_width=True)
-        
-        with col2:
-            # Top customers
-            top_customers = rfm.nlargest(10, 'Monetary')[['Monetary']].reset_index(drop=True)
-            top_customers['Customer'] = ['Customer ' + str(i+1) for i in range(len(top_customers))]
-            
-            fig6 = px.bar(top_customers, x='Monetary', y='Customer',
-                         orientation='h',
-                         title='Top 10 Customers by Revenue',
-                         color='Monetary',
-                         color_continuous_scale='Oranges')
-            fig6.update_layout(height=400, yaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig6, use_container_width=True)
-        
-        st.markdown("---")
+        render_revenue_analysis(rfm, seg_agg)
     
     # Row 4: Distributions
     if all(col in rfm_filtered.columns for col in ['Recency', 'Frequency', 'Monetary']):
-        st.header("📊 RFM Distributions")
-        tab1, tab2, tab3 = st.tabs(["Recency", "Frequency", "Monetary"])
-        
-        with tab1:
-            fig7 = px.histogram(rfm_filtered, x='Recency', nbins=50,
-                               title='Recency Distribution',
-                               labels={'Recency': 'Days Since Last Purchase'})
-            fig7.update_layout(height=350)
-            st.plotly_chart(fig7, use_container_width=True)
-        
-        with tab2:
-            fig8 = px.histogram(rfm_filtered, x='Frequency', nbins=50,
-                               title='Frequency Distribution',
-                               labels={'Frequency': 'Number of Purchases'})
-            fig8.update_layout(height=350)
-            st.plotly_chart(fig8, use_container_width=True)
-        
-        with tab3:
-            fig9 = px.histogram(rfm_filtered, x='Monetary', nbins=50,
-                               title='Monetary Distribution',
-                               labels={'Monetary': 'Total Spend ($)'})
-            fig9.update_layout(height=350)
-            st.plotly_chart(fig9, use_container_width=True)
-        
-        st.markdown("---")
+        render_distributions(rfm_filtered)
     
     # Segment Details Table
-    if 'Customer_Segment' in rfm.columns and all(col in rfm.columns for col in ['Recency', 'Frequency', 'Monetary']):
-        st.header("📋 Segment Summary Table")
-        segment_summary = rfm.groupby('Customer_Segment').agg({
-            'Recency': 'mean',
-            'Frequency': 'mean',
-            'Monetary': ['mean', 'sum', 'count']
-        }).round(2)
-        
-        segment_summary.columns = ['Avg Recency', 'Avg Frequency', 'Avg Monetary', 'Total Revenue', 'Customer Count']
-        segment_summary = segment_summary.sort_values('Total Revenue', ascending=False)
-        
-        st.dataframe(segment_summary, use_container_width=True)
-        
-        st.markdown("---")
+    if seg_agg is not None:
+        render_segment_summary(seg_agg)
     
     # Display raw data sample
-    st.header("📄 Raw Data Sample")
-    st.dataframe(rfm_filtered.head(20), use_container_width=True)
+    render_raw_sample(rfm_filtered)
     
     # Footer
     st.markdown("---")
@@ -256,4 +426,4 @@ if rfm is not None and df is not None:
     st.markdown("**Tech Stack:** Python, Pandas, Scikit-learn, Plotly, Streamlit")
 
 else:
-    st.error("❌ Could not load data files. Please check that 'rfm_analysis.csv' and 'cleaned_online_retail.csv' exist in the 'data' folder.")
\ No newline at end of file
+    st.error("❌ Could not load data files. Please check that 'rfm_analysis.csv' exists in the 'data' folder.")
\ No newline at end of file